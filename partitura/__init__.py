@@ -9,7 +9,7 @@ spelling, voice assignment, and key signature.
 import pkg_resources
 
 from .io import load_score, load_performance, load_score_as_part, lp
-from .io.musescore import load_via_musescore
+from .io.musescore import load_via_musescore, load_via_musescore_batch
 from .io.importmusicxml import load_musicxml, musicxml_to_notearray
 from .io.exportmusicxml import save_musicxml
 from .io.importmei import load_mei
@@ -54,6 +54,7 @@ __all__ = [
     "load_score_midi",
     "save_score_midi",
     "load_via_musescore",
+    "load_via_musescore_batch",
     "load_performance_midi",
     "save_performance_midi",
     "load_match",
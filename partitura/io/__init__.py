@@ -10,7 +10,7 @@ from urllib.parse import urlparse
 import tempfile
 from .importmusicxml import load_musicxml
 from .importmidi import load_score_midi, load_performance_midi
-from .musescore import load_via_musescore
+from .musescore import load_via_musescore, load_via_musescore_batch
 from .importmatch import load_match
 from .importmei import load_mei
 from .importkern import load_kern
@@ -3,9 +3,12 @@
 """
 This module contains methods for importing MIDI files.
 """
+import math
 import warnings
 
 from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 from typing import Union, Optional, List, Tuple, Dict
 import numpy as np
 
@@ -24,7 +27,6 @@ from partitura.utils import (
     get_document_name,
     ensure_notearray,
 )
-from partitura.utils.music import midi_ticks_to_seconds
 import partitura.musicanalysis as analysis
 
 __all__ = ["load_score_midi", "load_performance_midi", "midi_to_notearray"]
@@ -112,8 +114,10 @@ def load_performance_midi(
     ppq = mid.ticks_per_beat
     # microseconds per quarter
     default_mpq = int(60 * (10**6 / default_bpm))
+    # inverse of the number of ticks per microsecond per quarter
+    inv_ppq_us = 1.0 / (ppq * 10**6)
     # Initialize time conversion factor
-    time_conversion_factor = default_mpq / (ppq * 10**6)
+    time_conversion_factor = default_mpq * inv_ppq_us
 
     # Initialize list of tempos
     tempo_changes = [(0, default_mpq)]
@@ -145,20 +149,25 @@ def load_performance_midi(
 
         sounding_notes = {}
 
+        # note off messages without a matching note on
+        n_orphan_note_offs = 0
+        last_orphan_note_off = None
+
         for msg in track:
             # Update time deltas
             t += msg.time * time_conversion_factor
             ttick += msg.time
+            msg_type = msg.type
 
-            if isinstance(msg, mido.MetaMessage):
-                if msg.type == "set_tempo":
+            if msg.is_meta:
+                if msg_type == "set_tempo":
                     mpq = msg.tempo
                     if (
                         tempo_changes[-1][1] != mpq
                     ):  # only add new tempo if it's different from the last one
                         tempo_changes.append((ttick, mpq))
-                    time_conversion_factor = mpq / (ppq * 10**6)
-                elif msg.type == "time_signature":
+                    time_conversion_factor = mpq * inv_ppq_us
+                elif msg_type == "time_signature":
                     time_signatures.append(
                         dict(
                             time=t,
@@ -168,14 +177,14 @@ def load_performance_midi(
                             track=i,
                         )
                     )
-                elif msg.type == "key_signature":
-                    key_name = str(msg.key)
+                elif msg_type == "key_signature":
+                    key_name = msg.key
                     fifths, mode = key_name_to_fifths_mode(key_name)
                     key_signatures.append(
                         dict(
                             time=t,
                             time_tick=ttick,
-                            key_name=str(msg.key),
+                            key_name=key_name,
                             fifths=fifths,
                             mode=mode,
                             track=i,
@@ -186,22 +195,14 @@ def load_performance_midi(
                     # Other MetaMessages
                     # For more info, see
                     # https://mido.readthedocs.io/en/latest/meta_message_types.html
-                    msg_dict = dict(
-                        [
-                            ("time", t),
-                            ("time_tick", ttick),
-                            ("track", i),
-                        ]
-                        + [
-                            (key, val)
-                            for key, val in msg.__dict__.items()
-                            if key not in ("time", "track", "time_tick")
-                        ]
-                    )
+                    msg_dict = msg.dict()
+                    msg_dict["time"] = t
+                    msg_dict["time_tick"] = ttick
+                    msg_dict["track"] = i
 
                     meta_other.append(msg_dict)
 
-            elif msg.type == "control_change":
+            elif msg_type == "control_change":
                 controls.append(
                     dict(
                         time=t,
@@ -213,7 +214,7 @@ def load_performance_midi(
                     )
                 )
 
-            elif msg.type == "program_change":
+            elif msg_type == "program_change":
                 programs.append(
                     dict(
                         time=t,
@@ -225,8 +226,8 @@ def load_performance_midi(
                 )
 
             else:
-                note_on = msg.type == "note_on"
-                note_off = msg.type == "note_off"
+                note_on = msg_type == "note_on"
+                note_off = msg_type == "note_off"
 
                 if not (note_on or note_off):
                     continue
@@ -242,7 +243,8 @@ def load_performance_midi(
                 # end note if it's a 'note off' event or 'note on' with velocity 0
                 elif note_off or (note_on and msg.velocity == 0):
                     if note not in sounding_notes:
-                        warnings.warn(f"ignoring MIDI message {msg}")
+                        n_orphan_note_offs += 1
+                        last_orphan_note_off = msg
                         continue
 
                     # append the note to the list associated with the channel
@@ -262,6 +264,12 @@ def load_performance_midi(
                     # remove hash from dict
                     del sounding_notes[note]
 
+        if n_orphan_note_offs > 0:
+            warnings.warn(
+                f"ignoring {n_orphan_note_offs} note off MIDI message(s) without "
+                f"a matching note on in track {i} (last: {last_orphan_note_off})"
+            )
+
         # fix note ids so that it is sorted lexicographically
         # by onset, pitch, offset, channel and track
         notes.sort(
@@ -293,25 +301,34 @@ def load_performance_midi(
 
             pps.append(pp)
 
-    # adjust timing of events based on tempo changes
+    # adjust timing of events based on tempo changes. Each track starts
+    # counting ticks from 0, so the tempo changes of different tracks
+    # have to be brought into tick order
+    tempo_changes.sort(key=lambda x: x[0])
+    tempo_map = make_tempo_map(tempo_changes, inv_ppq_us)
     for pp in pps:
-        for note in pp.notes:
-            note["note_on"] = adjust_time(note["note_on_tick"], tempo_changes, ppq)
-            note["note_off"] = adjust_time(note["note_off_tick"], tempo_changes, ppq)
-        for control in pp.controls:
-            control["time"] = adjust_time(control["time_tick"], tempo_changes, ppq)
-        for program in pp.programs:
-            program["time"] = adjust_time(program["time_tick"], tempo_changes, ppq)
-        for time_signature in pp.time_signatures:
-            time_signature["time"] = adjust_time(
-                time_signature["time_tick"], tempo_changes, ppq
-            )
-        for key_signature in pp.key_signatures:
-            key_signature["time"] = adjust_time(
-                key_signature["time_tick"], tempo_changes, ppq
+        note_on = adjust_times(
+            [note["note_on_tick"] for note in pp.notes], tempo_map, inv_ppq_us
+        )
+        note_off = adjust_times(
+            [note["note_off_tick"] for note in pp.notes], tempo_map, inv_ppq_us
+        )
+        for note, on, off in zip(pp.notes, note_on, note_off):
+            note["note_on"] = on
+            note["note_off"] = off
+
+        for events in (
+            pp.controls,
+            pp.programs,
+            pp.time_signatures,
+            pp.key_signatures,
+            pp.meta_other,
+        ):
+            times = adjust_times(
+                [event["time_tick"] for event in events], tempo_map, inv_ppq_us
             )
-        for meta in pp.meta_other:
-            meta["time"] = adjust_time(meta["time_tick"], tempo_changes, ppq)
+            for event, time in zip(events, times):
+                event["time"] = time
 
     perf = performance.Performance(
         id=doc_name,
@@ -322,14 +339,18 @@ def load_performance_midi(
 
 def adjust_time(tick: int, tempo_changes: List[Tuple[int, int]], ppq: int) -> float:
     """
-    Adjust the time of an event based on tempo changes.
+    Adjust the time of an event based on tempo changes. To adjust the
+    times of many events, compute the tempo map once with
+    `make_tempo_map` and use `adjust_times`.
 
     Parameters
     ----------
     tick : int
         The tick position of the event.
     tempo_changes : list of tuple[int, int]
-        A list of tuples where each tuple contains a tick position and the corresponding microseconds per quarter note (mpq).
+        A list of tuples where each tuple contains a tick position and
+        the corresponding microseconds per quarter note (mpq), sorted
+        by tick position.
     ppq : int
         Pulses (ticks) per quarter note.
 
@@ -338,21 +359,83 @@ def adjust_time(tick: int, tempo_changes: List[Tuple[int, int]], ppq: int) -> fl
     float: The adjusted time of the event in seconds.
     """
 
+    inv_ppq_us = 1.0 / (ppq * 10**6)
     time = 0
     last_tick = 0
     last_mpq = tempo_changes[0][1]
     for change_tick, mpq in tempo_changes:
         if tick < change_tick:
             break
-        time += midi_ticks_to_seconds(
-            midi_ticks=(change_tick - last_tick), mpq=last_mpq, ppq=ppq
-        )
+        time += (change_tick - last_tick) * last_mpq * inv_ppq_us
         last_tick = change_tick
         last_mpq = mpq
-    time += (tick - last_tick) * (last_mpq / (ppq * 10**6))
+    time += (tick - last_tick) * last_mpq * inv_ppq_us
     return time
 
 
+def make_tempo_map(
+    tempo_changes: List[Tuple[int, int]], inv_ppq_us: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Precompute the tick position, microseconds per quarter note and
+    onset time in seconds of each tempo segment.
+
+    Parameters
+    ----------
+    tempo_changes : list of tuple[int, int]
+        A list of tuples where each tuple contains a tick position and
+        the corresponding microseconds per quarter note (mpq), sorted
+        by tick position.
+    inv_ppq_us : float
+        Inverse of the pulses (ticks) per quarter note times 10**6,
+        i.e., `1 / (ppq * 10**6)`.
+
+    Returns
+    -------
+    change_ticks : np.ndarray
+        Tick position of each tempo change.
+    mpqs : np.ndarray
+        Microseconds per quarter note starting at each tempo change.
+    change_times : np.ndarray
+        Time in seconds of each tempo change.
+    """
+    change_ticks = np.array([tick for tick, _ in tempo_changes], dtype=np.int64)
+    mpqs = np.array([mpq for _, mpq in tempo_changes], dtype=np.int64)
+    change_times = np.zeros(len(tempo_changes))
+    np.cumsum(np.diff(change_ticks) * mpqs[:-1] * inv_ppq_us, out=change_times[1:])
+    return change_ticks, mpqs, change_times
+
+
+def adjust_times(
+    ticks: Union[List[int], np.ndarray],
+    tempo_map: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    inv_ppq_us: float,
+) -> List[float]:
+    """
+    Adjust the time of several events based on tempo changes. This is
+    a vectorized version of `adjust_time`.
+
+    Parameters
+    ----------
+    ticks : list of int or np.ndarray
+        The tick positions of the events.
+    tempo_map : tuple of np.ndarray
+        The tempo map of the file, as computed by `make_tempo_map`.
+    inv_ppq_us : float
+        Inverse of the pulses (ticks) per quarter note times 10**6,
+        i.e., `1 / (ppq * 10**6)`.
+
+    Returns
+    ----------
+    list of float: The adjusted times of the events in seconds.
+    """
+    change_ticks, mpqs, change_times = tempo_map
+    ticks = np.asarray(ticks, dtype=np.int64)
+    idx = np.searchsorted(change_ticks, ticks, side="right") - 1
+    times = change_times[idx] + (ticks - change_ticks[idx]) * mpqs[idx] * inv_ppq_us
+    return times.tolist()
+
+
 @deprecated_parameter("ensure_list")
 @deprecated_alias(fn="filename")
 def load_score_midi(
@@ -477,11 +560,15 @@ or a list of these
         sounding_notes = {}
         # current time (will be updated by delta times in messages)
         t_raw = 0
+        # note off messages without a matching note on
+        n_orphan_note_offs = 0
+        last_orphan_note_off = None
 
         for msg in track:
             t_raw = t_raw + msg.time
+            msg_type = msg.type
 
-            if msg.type not in relevant:
+            if msg_type not in relevant:
                 continue
 
             if quantization_unit:
@@ -489,15 +576,15 @@ or a list of these
             else:
                 t = t_raw
 
-            if msg.type == "time_signature":
+            if msg_type == "time_signature":
                 time_sigs.append((t, msg.numerator, msg.denominator))
-            if msg.type == "key_signature":
+            if msg_type == "key_signature":
                 key_sigs.append((t, msg.key))
-            if msg.type == "set_tempo":
+            if msg_type == "set_tempo":
                 global_tempos.append((t, 60 * 10**6 / msg.tempo))
             else:
-                note_on = msg.type == "note_on"
-                note_off = msg.type == "note_off"
+                note_on = msg_type == "note_on"
+                note_off = msg_type == "note_off"
 
                 if not (note_on or note_off):
                     continue
@@ -513,7 +600,8 @@ or a list of these
                 # end note if it's a 'note off' event or 'note on' with velocity 0
                 elif note_off or (note_on and msg.velocity == 0):
                     if note not in sounding_notes:
-                        warnings.warn("ignoring MIDI message %s" % msg)
+                        n_orphan_note_offs += 1
+                        last_orphan_note_off = msg
                         continue
 
                     # append the note to the list associated with the channel
@@ -524,6 +612,13 @@ or a list of these
                     # remove hash from dict
                     del sounding_notes[note]
 
+        if n_orphan_note_offs > 0:
+            warnings.warn(
+                f"ignoring {n_orphan_note_offs} note off MIDI message(s) without "
+                f"a matching note on in track {track_nr} "
+                f"(last: {last_orphan_note_off})"
+            )
+
         # if a track has no notes, we assume it may contain global time/key sigs
         if not notes:
             global_time_sigs.extend(time_sigs)
@@ -729,40 +824,42 @@ def assign_group_part_voice(
 
     part_names = {}
     group_names = {}
-    for tr, ch in track_ch_combis:
+    # per-track state is computed once for all channels of a track
+    for tr, tr_ch_combis in groupby(track_ch_combis, key=itemgetter(0)):
+        track_name = track_names.get(tr, "Track {}".format(tr + 1))
         if mode == 0:
             prt = part_helper.setdefault(tr, len(part_helper))
             vc1 = voice_helper.setdefault(tr, {})
-            vc2 = vc1.setdefault(ch, len(vc1) + 1)
-            part_names[prt] = "{}".format(
-                track_names.get(tr, "Track {}".format(tr + 1))
-            )
-            part[(tr, ch)] = prt
-            voice[(tr, ch)] = vc2
+            part_names[prt] = "{}".format(track_name)
+            for tr_ch in tr_ch_combis:
+                part[tr_ch] = prt
+                voice[tr_ch] = vc1.setdefault(tr_ch[1], len(vc1) + 1)
         elif mode == 1:
             pg = part_group_helper.setdefault(tr, len(part_group_helper))
-            prt = part_helper.setdefault(ch, len(part_helper))
-            part_group.setdefault((tr, ch), pg)
-            group_names[pg] = track_names.get(tr, "Track {}".format(tr + 1))
-            part_names[prt] = "ch={}".format(ch)
-            part[(tr, ch)] = prt
+            group_names[pg] = track_name
+            for tr_ch in tr_ch_combis:
+                ch = tr_ch[1]
+                prt = part_helper.setdefault(ch, len(part_helper))
+                part_group.setdefault(tr_ch, pg)
+                part_names[prt] = "ch={}".format(ch)
+                part[tr_ch] = prt
         elif mode == 2:
             vc = voice_helper.setdefault(tr, len(voice_helper) + 1)
-            part.setdefault((tr, ch), 0)
-            voice[(tr, ch)] = vc
+            for tr_ch in tr_ch_combis:
+                part.setdefault(tr_ch, 0)
+                voice[tr_ch] = vc
         elif mode == 3:
             prt = part_helper.setdefault(tr, len(part_helper))
-            part_names[prt] = "{}".format(
-                track_names.get(tr, "Track {}".format(tr + 1))
-            )
-            part[(tr, ch)] = prt
+            part_names[prt] = "{}".format(track_name)
+            for tr_ch in tr_ch_combis:
+                part[tr_ch] = prt
         elif mode == 4:
-            part.setdefault((tr, ch), 0)
+            for tr_ch in tr_ch_combis:
+                part.setdefault(tr_ch, 0)
         elif mode == 5:
-            part_names[(tr, ch)] = "{} ch={}".format(
-                track_names.get(tr, "Track {}".format(tr + 1)), ch
-            )
-            part.setdefault((tr, ch), len(part))
+            for tr_ch in tr_ch_combis:
+                part_names[tr_ch] = "{} ch={}".format(track_name, tr_ch[1])
+                part.setdefault(tr_ch, len(part))
 
     return (
         [
@@ -860,30 +957,32 @@ def create_part(
 
     warnings.warn("add time sigs and measures", stacklevel=2)
 
-    for ts_start, num, den, ts_end in time_sigs:
-        time_sig = score.TimeSignature(num.item(), den.item())
-        part.add(time_sig, ts_start.item())
-
-    score.add_measures(part)
-
-    # this is the old way to add measures. Since part comes from MIDI we
-    # only have a single global divs value, which makes add it easier to compute
-    # measure durations:
-
-    # measure_counter = 1
-    # # we call item() on numpy numbers to get the value in the equivalent python type
-    # for ts_start, num, den, ts_end in time_sigs:
-    #     time_sig = score.TimeSignature(num.item(), den.item())
-    #     part.add(time_sig, ts_start.item())
-    #     measure_duration = (num.item() * ticks * 4) // den.item()
-    #     measure_start_limit = min(ts_end.item(), part.last_point.t)
-    #     for m_start in range(ts_start, measure_start_limit, measure_duration):
-    #         measure = score.Measure(number=measure_counter)
-    #         m_end = min(m_start+measure_duration, ts_end)
-    #         part.add(measure, m_start, m_end)
-    #         measure_counter += 1
-    #     if np.isinf(ts_end):
-    #         ts_end = m_end
+    # tolist() gives us the values as python ints
+    for ts_start, num, den, ts_end in time_sigs.tolist():
+        part.add(score.TimeSignature(num, den), ts_start)
+
+    # Since the part comes from MIDI we only have a single global divs value,
+    # which makes it easy to compute measure durations, and to create all
+    # measures of a time signature at once:
+    start = part.first_point.t
+    end = part.last_point.t
+    measure_time_sigs = time_sigs
+    # make sure we cover time from the start of the timeline
+    if time_sigs[0, 0] > start:
+        measure_time_sigs = np.vstack(([[start, 4, 4, time_sigs[0, 0]]], time_sigs))
+
+    measure_counter = 1
+    for ts_start, num, den, ts_end in measure_time_sigs.tolist():
+        measure_duration = (num * ticks * 4) // den
+        measure_end_limit = min(ts_end, end)
+        m_starts = np.arange(
+            ts_start, measure_end_limit, measure_duration, dtype=np.int64
+        )
+        m_ends = np.minimum(m_starts + measure_duration, measure_end_limit)
+        for m_start, m_end in zip(m_starts.tolist(), m_ends.tolist()):
+            measure = score.Measure(number=measure_counter, name=str(measure_counter))
+            part.add(measure, m_start, m_end)
+            measure_counter += 1
 
     warnings.warn("tie notes", stacklevel=2)
     # tie notes where necessary (across measure boundaries, and within measures
@@ -926,6 +1025,11 @@ def quantize(
     3.5
 
     """
+    # avoid the overhead of numpy for finite scalars (both round half to
+    # even). round() raises on nan and inf, so these are left to numpy
+    if isinstance(v, int) or (isinstance(v, float) and math.isfinite(v)):
+        r = unit * round(v / unit)
+        return int(r) if isinstance(unit, int) else r
 
     r = unit * np.round(v / unit)
     if isinstance(unit, int):
@@ -8,12 +8,14 @@ backend for loading and rendering scores.
 import platform
 import warnings
 import glob
+import json
 import os
 import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
-from tempfile import NamedTemporaryFile, TemporaryDirectory, gettempdir
-from typing import Optional, Union
+from tempfile import TemporaryDirectory, gettempdir
+from typing import List, Optional, Union
 
 from partitura.io.importmusicxml import load_musicxml
 from partitura.io.exportmusicxml import save_musicxml
@@ -28,6 +30,14 @@ from partitura.utils.misc import (
 )
 
 
+# MuseScore does not need any file descriptors of the calling process, so
+# we skip closing them all in the child (which costs one syscall per possible
+# descriptor on systems with a high open files limit). MuseScore stays in
+# the caller's process group, so that signals sent to the group (e.g. by a
+# shell or a batch job scheduler) also stop MuseScore.
+MSCORE_SUBPROCESS_KWARGS = dict(close_fds=False)
+
+
 class MuseScoreNotFoundException(Exception):
     pass
 
@@ -36,10 +46,14 @@ class FileImportException(Exception):
     pass
 
 
+@lru_cache(maxsize=None)
 def find_musescore_version(version=4):
     """Find the path to the MuseScore executable for a specific version.
     If version is a empty string it tries to find an unspecified version of
     MuseScore which is used in some systems.
+
+    The result is cached; use `find_musescore_version.cache_clear()` to
+    search the PATH again (e.g. after installing MuseScore).
     """
     result = shutil.which(f"musescore{version}")
     if result is None:
@@ -135,9 +149,47 @@ or a list of these
         One or more part or partgroup objects
 
     """
-    if filename.endswith(".mscz"):
-        pass
-    else:
+    return load_via_musescore_batch(
+        filenames=[filename],
+        validate=validate,
+        force_note_ids=force_note_ids,
+    )[0]
+
+
+def load_via_musescore_batch(
+    filenames: List[PathLike],
+    validate: bool = False,
+    force_note_ids: Optional[Union[bool, str]] = True,
+) -> List[Score]:
+    """Load several scores through a single call to the MuseScore program.
+
+    This function works like `load_via_musescore`, but converts all
+    files to MusicXML in a single MuseScore process (using a MuseScore
+    job file), so that the startup time of MuseScore is paid only once.
+
+    Parameters
+    ----------
+    filenames : list of str
+        Filenames of the scores to load
+    validate : bool, optional
+        When True the validity of the MusicXML generated by MuseScore is checked
+        against the MusicXML 3.1 specification before loading the file. An
+        exception will be raised when the MusicXML is invalid.
+        Defaults to False.
+    force_note_ids : bool, optional.
+        When True each Note in the returned Part(s) will have a newly
+        assigned unique id attribute. Existing note id attributes in
+        the MusicXML will be discarded.
+
+    Returns
+    -------
+    list of :class:`partitura.score.Score`
+        One score for each file in `filenames`, in the same order.
+
+    """
+    for filename in filenames:
+        if os.fspath(filename).endswith(".mscz"):
+            continue
         # open the file as text and check if the first symbol is "<" to avoid
         # further processing in case of non-XML files
         with open(filename, "r") as f:
@@ -148,33 +200,59 @@ or a list of these
 
     mscore_exec = find_musescore()
 
-    xml_fh = os.path.splitext(os.path.basename(filename))[0] + ".musicxml"
+    with TemporaryDirectory() as tmpdir:
+        xml_fns = [
+            os.path.join(tmpdir, "score_{}.musicxml".format(i))
+            for i in range(len(filenames))
+        ]
+        job_fn = os.path.join(tmpdir, "job.json")
+        with open(job_fn, "w") as f:
+            json.dump(
+                [
+                    {"in": os.path.abspath(filename), "out": xml_fn}
+                    for filename, xml_fn in zip(filenames, xml_fns)
+                ],
+                f,
+            )
 
-    cmd = [mscore_exec, "-o", xml_fh, filename, "-f"]
+        cmd = [mscore_exec, "-j", job_fn, "-f"]
 
-    try:
-        ps = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            ps = subprocess.run(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                **MSCORE_SUBPROCESS_KWARGS,
+            )
 
-        if ps.returncode != 0:
+            if ps.returncode != 0:
+                raise FileImportException(
+                    (
+                        "Command {} failed with code {}. MuseScore "
+                        "error messages:\n {}"
+                    ).format(cmd, ps.returncode, ps.stderr.decode("UTF-8"))
+                )
+        except FileNotFoundError as f:
             raise FileImportException(
-                (
-                    "Command {} failed with code {}. MuseScore " "error messages:\n {}"
-                ).format(cmd, ps.returncode, ps.stderr.decode("UTF-8"))
+                'Executing "{}" returned  {}.'.format(" ".join(cmd), f)
             )
-    except FileNotFoundError as f:
-        raise FileImportException(
-            'Executing "{}" returned  {}.'.format(" ".join(cmd), f)
-        )
 
-    score = load_musicxml(
-        filename=xml_fh,
-        validate=validate,
-        force_note_ids=force_note_ids,
-    )
+        for filename, xml_fn in zip(filenames, xml_fns):
+            if not os.path.exists(xml_fn):
+                raise FileImportException(
+                    "MuseScore did not convert {} to MusicXML.".format(filename)
+                )
 
-    os.remove(xml_fh)
+        scores = [
+            load_musicxml(
+                filename=xml_fn,
+                validate=validate,
+                force_note_ids=force_note_ids,
+            )
+            for xml_fn in xml_fns
+        ]
 
-    return score
+    return scores
 
 
 @deprecated_alias(out_fn="out", part="score_data")
@@ -212,8 +290,6 @@ def render_musescore(
         warnings.warn("warning: unsupported output format")
         return None
 
-    # with NamedTemporaryFile(suffix='.musicxml') as xml_fh, \
-    #      NamedTemporaryFile(suffix='.{}'.format(fmt)) as img_fh:
     with TemporaryDirectory() as tmpdir:
         xml_fh = Path(tmpdir) / "score.musicxml"
         img_fh = Path(tmpdir) / f"score.{fmt}"
@@ -232,14 +308,20 @@ def render_musescore(
             "-f",
         ]
         try:
-            ps = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # MuseScore's stdout is not needed, and stderr is only
+            # decoded when the command fails
+            ps = subprocess.run(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                **MSCORE_SUBPROCESS_KWARGS,
+            )
 
             if ps.returncode != 0:
                 warnings.warn(
-                    "Command {} failed with code {}; stdout: {}; stderr: {}".format(
+                    "Command {} failed with code {}; stderr: {}".format(
                         cmd,
                         ps.returncode,
-                        ps.stdout.decode("UTF-8"),
                         ps.stderr.decode("UTF-8"),
                     ),
                     SyntaxWarning,
@@ -255,15 +337,13 @@ def render_musescore(
             )
             return None
 
-        # LOGGER.error('Command "{}" returned with code {}; stdout: {}; stderr: {}'
-        #              .format(' '.join(cmd), ps.returncode, ps.stdout.decode('UTF-8'),
-        #                      ps.stderr.decode('UTF-8')))
-
         if fmt == "png":
             if PIL_EXISTS:
-                # get all generated image files
-                img_files = glob.glob(
-                    os.path.join(img_fh.parent, img_fh.stem + "-*.png")
+                # get all generated image files (one per page, named
+                # score-1.png, score-2.png, ...), sorted by page number
+                img_files = sorted(
+                    glob.glob(os.path.join(img_fh.parent, img_fh.stem + "-*.png")),
+                    key=lambda fn: int(Path(fn).stem.rsplit("-", 1)[-1]),
                 )
                 concatenate_images(
                     filenames=img_files,
@@ -6,7 +6,6 @@ This module contains methods to compute note-level features.
 import sys
 import warnings
 import numpy as np
-from scipy.interpolate import interp1d
 import partitura.score as score
 
 import types
@@ -14,6 +13,7 @@ from typing import List, Union, Tuple
 from partitura.utils import ensure_notearray, ensure_rest_array, clef_sign_to_int
 from partitura.score import ScoreLike
 from collections import defaultdict
+from functools import lru_cache
 
 __all__ = [
     "list_note_feats_functions",
@@ -75,6 +75,23 @@ def list_note_feats_functions():
     return bfs
 
 
+@lru_cache(maxsize=None)
+def _feature_function_table():
+    """Mapping from feature function names to the feature functions
+    defined in this module (see `list_note_feats_functions`).
+    """
+    module = sys.modules[__name__]
+    return {name: getattr(module, name) for name in list_note_feats_functions()}
+
+
+def _get_feature_function(name):
+    """Look up a feature function in this module by name."""
+    table = _feature_function_table()
+    if name in table:
+        return table[name]
+    return getattr(sys.modules[__name__], name)
+
+
 def make_note_features(
     part: ScoreLike,
     feature_functions: Union[List, str],
@@ -133,18 +150,21 @@ def make_note_features(
         include_time_signature=True,
     )
 
-    if len(set(na["id"])) != len(na):
+    n_unique_ids = len(set(na["id"]))
+    if n_unique_ids != len(na):
         warnings.warn(
             "Length of note array {0} "
             "does not correspond to number of unique IDs {1}. "
             "Some feature functions may return spurious values.".format(
-                len(na), len(set(na["id"]))
+                len(na), n_unique_ids
             )
         )
 
+    notes_tied = part.notes_tied
+    module_functions = set(_feature_function_table().values())
     acc = []
     if isinstance(feature_functions, str) and feature_functions == "all":
-        feature_functions = list_note_feats_functions()
+        feature_functions = list(_feature_function_table())
     elif not isinstance(feature_functions, list):
         raise TypeError(
             "feature_functions variable {} needs to be list or all".format(
@@ -155,27 +175,29 @@ def make_note_features(
     for bf in feature_functions:
         # skip time_signature_feature if force_fixed_size is True
         if force_fixed_size and (
-            bf == "time_signature_feature" or bf == time_signature_feature
+            bf == "time_signature_feature" or bf is time_signature_feature
         ):
             continue
         # skip metrical_feature if force_fixed_size is True
-        if force_fixed_size and (bf == "metrical_feature" or bf == metrical_feature):
+        if force_fixed_size and (bf == "metrical_feature" or bf is metrical_feature):
             continue
 
         if isinstance(bf, str):
             # get function by name from module
-            func = getattr(sys.modules[__name__], bf)
+            func = _get_feature_function(bf)
         elif isinstance(bf, types.FunctionType):
             func = bf
         else:
             warnings.warn("Ignoring unknown feature function {}".format(bf))
-        bf, bn = func(
-            na,
-            part,
+        func_kwargs = dict(
             include_empty_features=(
                 True if force_fixed_size else include_empty_features
-            ),
+            )
         )
+        # only the feature functions of this module accept notes_tied
+        if func in module_functions:
+            func_kwargs["notes_tied"] = notes_tied
+        bf, bn = func(na, part, **func_kwargs)
         # check if the size and number of the feature function are correct
         if bf.size != 0:
             if bf.shape[1] != len(bn):
@@ -184,7 +206,7 @@ def make_note_features(
                     "number of feature {}".format(len(bn), bf.shape[1])
                 )
                 raise InvalidNoteFeatureException(msg)
-            n_notes = len(part.notes_tied)
+            n_notes = len(notes_tied)
             if len(bf) != n_notes:
                 msg = (
                     "length of feature {} does not equal "
@@ -192,10 +214,8 @@ def make_note_features(
                 )
                 raise InvalidNoteFeatureException(msg)
 
-            if np.any(np.logical_or(np.isnan(bf), np.isinf(bf))):
-                problematic = np.unique(
-                    np.where(np.logical_or(np.isnan(bf), np.isinf(bf)))[1]
-                )
+            if not np.isfinite(bf).all():
+                problematic = np.unique(np.where(~np.isfinite(bf))[1])
                 msg = "NaNs or Infs found in the following feature: {} ".format(
                     ", ".join(np.array(bn)[problematic])
                 )
@@ -208,19 +228,20 @@ def make_note_features(
 
     if add_idx:
         _data, _names = zip(*acc)
-        feature_data = np.column_stack(_data)
-        feature_data_list = [list(f) + [i] for f, i in zip(feature_data, na["id"])]
+        feature_data = np.concatenate(_data, axis=1)
         feature_names = [n for ns in _names for n in ns] + ["id"]
         feature_names_dtypes = list(
             zip(feature_names, ["f4"] * (len(feature_names) - 1) + ["U256"])
         )
-        feature_data_struct = np.array(
-            [tuple(f) for f in feature_data_list], dtype=feature_names_dtypes
-        )
+        # fill the structured array column by column
+        feature_data_struct = np.empty(len(feature_data), dtype=feature_names_dtypes)
+        for j, name in enumerate(feature_names[:-1]):
+            feature_data_struct[name] = feature_data[:, j]
+        feature_data_struct["id"] = na["id"]
         return feature_data_struct
     else:
         _data, _names = zip(*acc)
-        feature_data = np.column_stack(_data)
+        feature_data = np.concatenate(_data, axis=1)
         feature_names = [n for ns in _names for n in ns]
         return feature_data, feature_names
 
@@ -267,18 +288,20 @@ def make_rest_features(
     if na.size == 0:
         return np.array([])
 
-    if len(set(na["id"])) != len(na):
+    n_unique_ids = len(set(na["id"]))
+    if n_unique_ids != len(na):
         warnings.warn(
             "Length of rest array {0} "
             "does not correspond to number of unique IDs {1}. "
             "Some feature functions may return spurious values.".format(
-                len(na), len(set(na["id"]))
+                len(na), n_unique_ids
             )
         )
 
+    n_notes = len(part.rests)
     acc = []
     if isinstance(feature_functions, str) and feature_functions == "all":
-        feature_functions = list_note_feats_functions()
+        feature_functions = list(_feature_function_table())
     elif not isinstance(feature_functions, list):
         raise TypeError(
             "feature_functions variable {} needs to be list or all".format(
@@ -289,7 +312,7 @@ def make_rest_features(
     for bf in feature_functions:
         if isinstance(bf, str):
             # get function by name from module
-            func = getattr(sys.modules[__name__], bf)
+            func = _get_feature_function(bf)
         elif isinstance(bf, types.FunctionType):
             func = bf
         else:
@@ -303,7 +326,6 @@ def make_rest_features(
                     "number of feature {}".format(len(bn), bf.shape[1])
                 )
                 raise InvalidNoteFeatureException(msg)
-            n_notes = len(part.rests)
             if len(bf) != n_notes:
                 msg = (
                     "length of feature {} does not equal "
@@ -311,10 +333,8 @@ def make_rest_features(
                 )
                 raise InvalidNoteFeatureException(msg)
 
-            if np.any(np.logical_or(np.isnan(bf), np.isinf(bf))):
-                problematic = np.unique(
-                    np.where(np.logical_or(np.isnan(bf), np.isinf(bf)))[1]
-                )
+            if not np.isfinite(bf).all():
+                problematic = np.unique(np.where(~np.isfinite(bf))[1])
                 msg = "NaNs or Infs found in the following feature: {} ".format(
                     ", ".join(np.array(bn)[problematic])
                 )
@@ -327,19 +347,20 @@ def make_rest_features(
 
     if add_idx:
         _data, _names = zip(*acc)
-        feature_data = np.column_stack(_data)
-        feature_data_list = [list(f) + [i] for f, i in zip(feature_data, na["id"])]
+        feature_data = np.concatenate(_data, axis=1)
         feature_names = [n for ns in _names for n in ns] + ["id"]
         feature_names_dtypes = list(
             zip(feature_names, ["f4"] * (len(feature_names) - 1) + ["U256"])
         )
-        feature_data_struct = np.array(
-            [tuple(f) for f in feature_data_list], dtype=feature_names_dtypes
-        )
+        # fill the structured array column by column
+        feature_data_struct = np.empty(len(feature_data), dtype=feature_names_dtypes)
+        for j, name in enumerate(feature_names[:-1]):
+            feature_data_struct[name] = feature_data[:, j]
+        feature_data_struct["id"] = na["id"]
         return feature_data_struct
     else:
         _data, _names = zip(*acc)
-        feature_data = np.column_stack(_data)
+        feature_data = np.concatenate(_data, axis=1)
         feature_names = [n for ns in _names for n in ns]
         return feature_data, feature_names
 
@@ -435,11 +456,45 @@ def compute_note_array(
         feature_data_struct = make_note_feats(
             part, feature_functions, add_idx=True, force_fixed_size=force_fixed_size
         )
-        note_array_joined = np.lib.recfunctions.join_by("id", na, feature_data_struct)
-        note_array = note_array_joined.data
-        sort_idx = np.lexsort(
-            (note_array["duration_div"], note_array["pitch"], note_array["onset_div"])
+        # join the features to the note array by note id
+        feature_rows = {nid: i for i, nid in enumerate(feature_data_struct["id"])}
+        rows = np.fromiter(
+            (feature_rows[nid] for nid in na["id"]), dtype=int, count=len(na)
+        )
+        na_fields = [name for name in na.dtype.names if name != "id"]
+        feature_fields = [
+            name for name in feature_data_struct.dtype.names if name != "id"
+        ]
+        note_array = np.empty(
+            len(na),
+            dtype=[("id", max(na.dtype["id"], feature_data_struct.dtype["id"]))]
+            + [(name, na.dtype[name]) for name in na_fields]
+            + [(name, feature_data_struct.dtype[name]) for name in feature_fields],
         )
+        note_array["id"] = na["id"]
+        for name in na_fields:
+            note_array[name] = na[name]
+        for name in feature_fields:
+            note_array[name] = feature_data_struct[name][rows]
+        # order by id (like a join), ties in the sort below keep this order
+        note_array = note_array[np.argsort(note_array["id"], kind="stable")]
+        onsets = note_array["onset_div"].astype(np.int64)
+        pitches = note_array["pitch"].astype(np.int64)
+        durations = note_array["duration_div"].astype(np.int64)
+        if (
+            len(note_array) > 0
+            and onsets.min() >= 0
+            and onsets.max() < 2**31
+            and pitches.min() >= 0
+            and pitches.max() < 2**16
+            and durations.min() >= 0
+            and durations.max() < 2**16
+        ):
+            # pack onset, pitch and duration into a single sort key
+            sort_key = (onsets << 32) | (pitches << 16) | durations
+            sort_idx = np.argsort(sort_key, kind="stable")
+        else:
+            sort_idx = np.lexsort((durations, pitches, onsets))
         note_array = note_array[sort_idx]
     else:
         note_array = na
@@ -463,11 +518,11 @@ def full_note_array(part):
 
 def polynomial_pitch_feature(na, part, **kwargs):
     """Normalize pitch feature."""
-    pitches = na["pitch"].astype(float)
     feature_names = ["pitch"]
     max_pitch = 127
-    W = pitches / max_pitch
-    return np.expand_dims(W, axis=1), feature_names
+    W = np.empty((len(na), 1), dtype=np.float32)
+    np.divide(na["pitch"], max_pitch, out=W[:, 0])
+    return W, feature_names
 
 
 def duration_feature(na, part, **kwargs):
@@ -499,9 +554,17 @@ def onset_feature(na, part, **kwargs):
     feature_names = ["onset", "score_position"]
 
     onsets_beat = na["onset_beat"]
-    rel_position = normalize(onsets_beat, method="minmax")
 
-    W = np.column_stack((onsets_beat, rel_position))
+    W = np.empty((len(onsets_beat), 2), dtype=onsets_beat.dtype)
+    W[:, 0] = onsets_beat
+    # min-max normalized onsets (as in `normalize`), computed in place
+    vmin = onsets_beat.min()
+    vmax = onsets_beat.max()
+    if np.isclose(vmin, vmax):
+        W[:, 1] = 0
+    else:
+        np.subtract(onsets_beat, vmin, out=W[:, 1])
+        W[:, 1] /= vmax - vmin
 
     return W, feature_names
 
@@ -511,6 +574,30 @@ def relative_score_position_feature(na, part, **kwargs):
     return W[:, 1:], names[1:]
 
 
+def get_notes_tied(part, **kwargs):
+    """Return the tied notes of a part.
+
+    Feature functions called from `make_note_features` receive the
+    list of tied notes as the `notes_tied` keyword argument, so that
+    it is computed only once per part. When called directly, the list
+    is taken from the part.
+
+    Parameters
+    ----------
+    part : Part
+        The part.
+    **kwargs
+        The keyword arguments passed to the feature function.
+
+    Returns
+    -------
+    list
+        List of Note objects, as returned by `part.notes_tied`.
+    """
+    notes_tied = kwargs.get("notes_tied")
+    return part.notes_tied if notes_tied is None else notes_tied
+
+
 def grace_feature(na, part, **kwargs):
     """Grace feature.
 
@@ -525,24 +612,29 @@ def grace_feature(na, part, **kwargs):
 
     feature_names = ["grace_note", "n_grace", "grace_pos"]
 
-    W = np.zeros((len(na), 3))
+    W = np.zeros((len(na), 3), dtype=np.float32)
     W[:, 0] = na["is_grace"]
-    grace_notes = na[np.nonzero(na["is_grace"])]
-    notes = (
-        {n.id: n for n in part.notes_tied}
-        if not np.all(na["pitch"] == 0)
-        else {n.id: n for n in part.rests}
-    )
     indices = np.nonzero(na["is_grace"])[0]
-    for i, index in enumerate(indices):
-        grace = grace_notes[i]
-        n_grace = np.count_nonzero(grace_notes["onset_beat"] == grace["onset_beat"])
-        W[index, 1] = n_grace
-        W[index, 2] = (
-            n_grace - sum(1 for _ in notes[grace["id"]].iter_grace_seq()) + 1
-            if grace["id"] not in (None, "None", "")
-            else 0
-        )
+    if len(indices) == 0:
+        return W, feature_names
+
+    grace_notes = na[indices]
+    notes_list = (
+        get_notes_tied(part, **kwargs) if not np.all(na["pitch"] == 0) else part.rests
+    )
+    notes = {n.id: n for n in notes_list}
+    # number of grace notes sharing the onset of each grace note
+    _, inverse, counts = np.unique(
+        grace_notes["onset_beat"], return_inverse=True, return_counts=True
+    )
+    n_grace = counts[inverse]
+    W[indices, 1] = n_grace
+    has_id = np.array([i not in (None, "None", "") for i in grace_notes["id"]])
+    seq_len = np.array(
+        [sum(1 for _ in notes[i].iter_grace_seq()) for i in grace_notes["id"][has_id]],
+        dtype=int,
+    )
+    W[indices[has_id], 2] = n_grace[has_id] - seq_len + 1
     return W, feature_names
 
 
@@ -553,54 +645,48 @@ def clef_feature(na, part, **kwargs):
     Note that this feature does not return the staff number per note,
     see staff_feature for this information.
     """
-    notes = {n.id: n for n in part.notes_tied}
+    notes = get_notes_tied(part, **kwargs)
+    id_to_row = {n.id: i for i, n in enumerate(notes)}
     names = ["clef_sign", "clef_line", "clef_octave_change"]
-    clef_dict = defaultdict(list)
-    staff_numbers = set()
-    clef_list = [clef for clef in part.iter_all(score.Clef)]
-    if len(clef_list) > 0:
-        for clef in clef_list:
-            staff = clef.staff or 1
-            staff_numbers.add(staff)
-            time_key = "time_" + str(staff)
-            clef_key = "clef_" + str(staff)
-            clef_dict[time_key].append(clef.start.t)
-            clef_dict[clef_key].append(clef)
-
-        for staff in staff_numbers:
-            time_key = "time_" + str(staff)
-            interpolator_key = "interp_" + str(staff)
-            start_times = np.array(clef_dict[time_key])
-            clef_indices = np.arange(len(start_times))
-            interpolator = interp1d(
-                start_times,
-                clef_indices,
-                kind="previous",
-                bounds_error=False,
-                fill_value="extrapolate",
+    clefs_by_staff = defaultdict(list)
+    for clef in part.iter_all(score.Clef):
+        clefs_by_staff[clef.staff or 1].append(clef)
+
+    # notes on staves without a clef get a dummy clef
+    W = np.empty((len(id_to_row), 3), dtype=np.float32)
+    W[:, 0] = 6  # "none"
+    W[:, 1:] = 0
+
+    if len(clefs_by_staff) > 0:
+        # staff and onset of every note, in a single pass over the notes
+        staffs = np.fromiter((n.staff or 1 for n in notes), dtype=int, count=len(notes))
+        times = np.fromiter((n.start.t for n in notes), dtype=int, count=len(notes))
+        rows = np.fromiter((id_to_row[i] for i in na["id"]), dtype=int, count=len(na))
+        note_staffs = staffs[rows]
+        note_times = times[rows]
+
+        for staff, clefs in clefs_by_staff.items():
+            mask = note_staffs == staff
+            if not np.any(mask):
+                continue
+            start_times = np.array([clef.start.t for clef in clefs])
+            order = np.argsort(start_times, kind="stable")
+            clef_props = np.array(
+                [
+                    (
+                        clef_sign_to_int(clef.sign or "none"),
+                        clef.line or 0,
+                        clef.octave_change or 0,
+                    )
+                    for clef in clefs
+                ]
+            )[order]
+            # index of the last clef starting at or before each note
+            # (notes before the first clef take the first clef)
+            clef_idx = np.searchsorted(
+                start_times[order], note_times[mask], side="right"
             )
-            clef_dict[interpolator_key].append(interpolator)
-
-        W = np.zeros((len(notes), 3))
-        for i, na_n in enumerate(na):
-            n = notes[na_n["id"]]
-            staff = n.staff or 1
-            time = n.start.t
-            clef_key = "clef_" + str(staff)
-            interpolator_key = "interp_" + str(staff)
-            clef_idx = clef_dict[interpolator_key][0](time)
-            clef = clef_dict[clef_key][int(clef_idx)]
-            sign = clef.sign or "none"
-            W[i, 0] = clef_sign_to_int(sign)
-            W[i, 1] = clef.line or 0
-            W[i, 2] = clef.octave_change or 0
-
-    else:
-        # add dummy clef
-        W = np.zeros((len(notes), 3))
-        W[:, 0] = 6  # "none"
-        W[:, 1] = 0
-        W[:, 2] = 0
+            W[mask] = clef_props[np.maximum(clef_idx - 1, 0)]
 
     return W, names
 
@@ -624,60 +710,45 @@ def loudness_direction_feature(na, part, **kwargs):
     """
 
     onsets = na["onset_div"]
-    N = len(onsets)
     constant = ["ppp", "pp", "p", "mp", "mf", "f", "ff", "fff", "unknown_constant"]
     impulsive = ["fp", "sf", "sfp", "sfz", "unknown_impulsive"]
     names = constant + impulsive + ["loudness_incr", "loudness_decr"]
 
     directions = list(part.iter_all(score.LoudnessDirection, include_subclasses=True))
-    if "include_empty_features" in kwargs.keys():
-        force_size = kwargs["include_empty_features"]
-    else:
-        force_size = False
+    force_size = kwargs.get("include_empty_features", False)
     if force_size:
-
-        def to_name(d):
-            if isinstance(d, score.ConstantLoudnessDirection):
-                if d.text in constant:
-                    return d.text
-                else:
-                    return "unknown_constant"
-            elif isinstance(d, score.ImpulsiveLoudnessDirection):
-                if d.text in impulsive:
-                    return d.text
-                else:
-                    return "unknown_impulsive"
-            elif isinstance(d, score.IncreasingLoudnessDirection):
-                return "loudness_incr"
-            elif isinstance(d, score.DecreasingLoudnessDirection):
-                return "loudness_decr"
-
+        handlers = [
+            (
+                score.ConstantLoudnessDirection,
+                lambda d: d.text if d.text in constant else "unknown_constant",
+            ),
+            (
+                score.ImpulsiveLoudnessDirection,
+                lambda d: d.text if d.text in impulsive else "unknown_impulsive",
+            ),
+            (score.IncreasingLoudnessDirection, lambda d: "loudness_incr"),
+            (score.DecreasingLoudnessDirection, lambda d: "loudness_decr"),
+        ]
     else:
+        handlers = [
+            (score.ConstantLoudnessDirection, lambda d: d.text),
+            (score.ImpulsiveLoudnessDirection, lambda d: d.text),
+            (score.IncreasingLoudnessDirection, lambda d: "loudness_incr"),
+            (score.DecreasingLoudnessDirection, lambda d: "loudness_decr"),
+        ]
+    to_name = type_dispatch(handlers)
 
-        def to_name(d):
-            if isinstance(d, score.ConstantLoudnessDirection):
-                return d.text
-            elif isinstance(d, score.ImpulsiveLoudnessDirection):
-                return d.text
-            elif isinstance(d, score.IncreasingLoudnessDirection):
-                return "loudness_incr"
-            elif isinstance(d, score.DecreasingLoudnessDirection):
-                return "loudness_decr"
-
-    feature_by_name = {}
-    for d in directions:
-        j, bf = feature_by_name.setdefault(
-            to_name(d), (len(feature_by_name), np.zeros(N))
-        )
-        bf += feature_function_activation(d)(onsets)
+    feature_by_name = direction_activations(onsets, directions, to_name)
 
-    if not force_size:
+    if force_size:
+        name_to_col = {name: j for j, name in enumerate(names)}
+    else:
         M = len(feature_by_name) if len(feature_by_name) > 0 else 1
         names = [None] * M
-    W = np.zeros((len(onsets), len(names)))
+    W = np.zeros((len(onsets), len(names)), dtype=np.float32)
     for name, (j, bf) in feature_by_name.items():
         if force_size:
-            j = names.index(name)
+            j = name_to_col[name]
         else:
             names[j] = name
         W[:, j] = bf
@@ -698,7 +769,6 @@ def tempo_direction_feature(na, part, **kwargs):
 
     """
     onsets = na["onset_div"]
-    N = len(onsets)
     constant = [
         "adagio",
         "largo",
@@ -719,65 +789,42 @@ def tempo_direction_feature(na, part, **kwargs):
     names = constant + ["tempo_incr", "tempo_decr"]
     directions = list(part.iter_all(score.TempoDirection, include_subclasses=True))
 
-    if "include_empty_features" in kwargs.keys():
-        force_size = kwargs["include_empty_features"]
-    else:
-        force_size = False
+    force_size = kwargs.get("include_empty_features", False)
+
+    def reset_name(d):
+        return d.reference_tempo.text if d.reference_tempo else d.text
+
     if force_size:
 
-        def to_name(d):
-            if isinstance(d, score.ResetTempoDirection):
-                ref = d.reference_tempo
-                if ref:
-                    if ref.text in constant:
-                        return ref.text
-                    else:
-                        return "unknown_constant"
-                else:
-                    if d.text in constant:
-                        return d.text
-                    else:
-                        return "unknown_constant"
-            elif isinstance(d, score.ConstantTempoDirection):
-                if d.text in constant:
-                    return d.text
-                else:
-                    return "unknown_constant"
-            elif isinstance(d, score.IncreasingTempoDirection):
-                return "tempo_incr"
-            elif isinstance(d, score.DecreasingTempoDirection):
-                return "tempo_decr"
+        def known(name):
+            return name if name in constant else "unknown_constant"
 
+        handlers = [
+            (score.ResetTempoDirection, lambda d: known(reset_name(d))),
+            (score.ConstantTempoDirection, lambda d: known(d.text)),
+            (score.IncreasingTempoDirection, lambda d: "tempo_incr"),
+            (score.DecreasingTempoDirection, lambda d: "tempo_decr"),
+        ]
     else:
+        handlers = [
+            (score.ResetTempoDirection, reset_name),
+            (score.ConstantTempoDirection, lambda d: d.text),
+            (score.IncreasingTempoDirection, lambda d: "tempo_incr"),
+            (score.DecreasingTempoDirection, lambda d: "tempo_decr"),
+        ]
+    to_name = type_dispatch(handlers)
 
-        def to_name(d):
-            if isinstance(d, score.ResetTempoDirection):
-                ref = d.reference_tempo
-                if ref:
-                    return ref.text
-                else:
-                    return d.text
-            elif isinstance(d, score.ConstantTempoDirection):
-                return d.text
-            elif isinstance(d, score.IncreasingTempoDirection):
-                return "tempo_incr"
-            elif isinstance(d, score.DecreasingTempoDirection):
-                return "tempo_decr"
+    feature_by_name = direction_activations(onsets, directions, to_name)
 
-    feature_by_name = {}
-    for d in directions:
-        j, bf = feature_by_name.setdefault(
-            to_name(d), (len(feature_by_name), np.zeros(N))
-        )
-        bf += feature_function_activation(d)(onsets)
-
-    if not force_size:
+    if force_size:
+        name_to_col = {name: j for j, name in enumerate(names)}
+    else:
         M = len(feature_by_name) if len(feature_by_name) > 0 else 1
         names = [None] * M
-    W = np.zeros((len(onsets), len(names)))
+    W = np.zeros((len(onsets), len(names)), dtype=np.float32)
     for name, (j, bf) in feature_by_name.items():
         if force_size:
-            j = names.index(name)
+            j = name_to_col[name]
         else:
             names[j] = name
         W[:, j] = bf
@@ -788,17 +835,13 @@ def tempo_direction_feature(na, part, **kwargs):
 def articulation_direction_feature(na, part, **kwargs):
     """ """
     onsets = na["onset_div"]
-    N = len(onsets)
 
     directions = list(
         part.iter_all(score.ArticulationDirection, include_subclasses=True)
     )
     constant_names = ["staccato", "tenuto", "accent", "marcato", "unknown_articulation"]
 
-    if "include_empty_features" in kwargs.keys():
-        force_size = kwargs["include_empty_features"]
-    else:
-        force_size = False
+    force_size = kwargs.get("include_empty_features", False)
     if force_size:
 
         def to_name(d):
@@ -812,25 +855,20 @@ def articulation_direction_feature(na, part, **kwargs):
         def to_name(d):
             return d.text
 
-    feature_by_name = {}
-
-    for d in directions:
-        j, bf = feature_by_name.setdefault(
-            to_name(d), (len(feature_by_name), np.zeros(N))
-        )
-        bf += feature_function_activation(d)(onsets)
+    feature_by_name = direction_activations(onsets, directions, to_name)
 
     if force_size:
-        W = np.zeros((len(onsets), len(constant_names)))
+        W = np.zeros((len(onsets), len(constant_names)), dtype=np.float32)
         names = constant_names
+        name_to_col = {name: j for j, name in enumerate(names)}
     else:
         M = len(feature_by_name) if len(feature_by_name) > 0 else 1
-        W = np.zeros((len(onsets), M))
+        W = np.zeros((len(onsets), M), dtype=np.float32)
         names = [None] * M
 
     for name, (j, bf) in feature_by_name.items():
         if force_size:
-            j = names.index(name)
+            j = name_to_col[name]
         else:
             names[j] = name
         W[:, j] = bf
@@ -838,7 +876,86 @@ def articulation_direction_feature(na, part, **kwargs):
     return W, names
 
 
+def type_dispatch(handlers):
+    """Create a function that applies the handler for the type of its
+    argument.
+
+    The handler for a type is the first handler in `handlers` whose
+    class the type is a subclass of (like a chain of `isinstance`
+    checks); it is looked up once per type. Objects without a handler
+    are mapped to None.
+
+    Parameters
+    ----------
+    handlers : list
+        A list of `(cls, handler)` tuples.
+
+    Returns
+    -------
+    callable
+        The dispatching function.
+    """
+    by_type = {}
+
+    def dispatch(obj):
+        obj_type = type(obj)
+        handler = by_type.get(obj_type)
+        if handler is None:
+            handler = next(
+                (h for cls, h in handlers if issubclass(obj_type, cls)),
+                lambda obj: None,
+            )
+            by_type[obj_type] = handler
+        return handler(obj)
+
+    return dispatch
+
+
+def direction_activations(onsets, directions, to_name):
+    """Accumulate the activations of directions at the given onsets.
+
+    The activations of all directions mapping to the same name (as
+    given by `to_name`) are summed. Each direction is only evaluated
+    for the onsets within the support of its activation function.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping each name to a tuple `(j, activation)`,
+        where `j` is the order in which the name was first encountered.
+    """
+    N = len(onsets)
+    order = np.argsort(onsets, kind="mergesort")
+    sorted_onsets = onsets[order]
+
+    # collect the names and activation breakpoints of all directions first,
+    # so that the supports can be located with a single searchsorted call
+    names = [to_name(d) for d in directions]
+    activations = [feature_function_activation(d) for d in directions]
+    support_start = np.array([xs[0] for xs, _ in activations], dtype=float)
+    support_end = np.array([xs[-1] for xs, _ in activations], dtype=float)
+    los = np.searchsorted(sorted_onsets, support_start, side="left")
+    his = np.searchsorted(sorted_onsets, support_end, side="right")
+
+    feature_by_name = {}
+    for name, (xs, ys), lo, hi in zip(names, activations, los, his):
+        if name not in feature_by_name:
+            feature_by_name[name] = (
+                len(feature_by_name),
+                np.zeros(N, dtype=np.float32),
+            )
+        j, bf = feature_by_name[name]
+        bf[order[lo:hi]] += np.interp(sorted_onsets[lo:hi], xs, ys)
+    return feature_by_name
+
+
 def feature_function_activation(direction):
+    """Piecewise linear activation of a direction over time.
+
+    Returns the breakpoints `(xs, ys)` of the activation function,
+    sorted by time, so that it can be evaluated with
+    `np.interp(t, xs, ys, left=0.0, right=0.0)`.
+    """
     epsilon = 1e-6
 
     if isinstance(
@@ -884,7 +1001,10 @@ def feature_function_activation(direction):
         ]
         y = [0, 1, 0]
 
-    return interp1d(x, y, bounds_error=False, fill_value=0)
+    # np.interp requires increasing breakpoints (e.g. a dynamic direction
+    # without end may end at the start of its measure, before its start)
+    order = np.argsort(x, kind="mergesort")
+    return np.asarray(x, dtype=float)[order], np.asarray(y, dtype=float)[order]
 
 
 def slur_feature(na, part, **kwargs):
@@ -901,17 +1021,22 @@ def slur_feature(na, part, **kwargs):
     onsets = na["onset_div"]
     slurs = part.iter_all(score.Slur)
     W = np.zeros((len(onsets), 2))
+    order = np.argsort(onsets, kind="mergesort")
+    sorted_onsets = onsets[order]
 
     for slur in slurs:
         if not slur.end:
             continue
-        x = [slur.start.t, slur.end.t]
-        y_inc = [0, 1]
-        y_dec = [1, 0]
-        W[:, 0] += interp1d(x, y_inc, bounds_error=False, fill_value=0)(onsets)
-        W[:, 1] += interp1d(x, y_dec, bounds_error=False, fill_value=0)(onsets)
-    # Filter out NaN values
-    W[np.isnan(W)] = 0.0
+        x = np.array([slur.start.t, slur.end.t], dtype=float)
+        y_inc = np.array([0.0, 1.0])
+        y_dec = np.array([1.0, 0.0])
+        if x[1] < x[0]:
+            x, y_inc, y_dec = x[::-1], y_inc[::-1], y_dec[::-1]
+        # only the onsets within the slur are affected
+        lo = np.searchsorted(sorted_onsets, x[0], side="left")
+        hi = np.searchsorted(sorted_onsets, x[1], side="right")
+        W[order[lo:hi], 0] += np.interp(sorted_onsets[lo:hi], x, y_inc)
+        W[order[lo:hi], 1] += np.interp(sorted_onsets[lo:hi], x, y_dec)
     return W, names
 
 
@@ -945,37 +1070,35 @@ def articulation_feature(na, part, **kwargs):
         "unstress",
         "soft-accent",
     ]
-    if "include_empty_features" in kwargs:
-        force_size = kwargs["include_empty_features"]
-    else:
-        force_size = False
+    force_size = kwargs.get("include_empty_features", False)
 
-    feature_by_name = {}
-    notes = {n.id: n for n in part.notes_tied}
+    name_to_col = {name: j for j, name in enumerate(names)}
+    # columns of the articulations in the order they are encountered
+    used_cols = {}
+    notes = {n.id: n for n in get_notes_tied(part, **kwargs)}
     N = len(notes)
-    for i, na_n in enumerate(na):
-        n = notes[na_n["id"]]
+    if not any(n.articulations for n in notes.values()):
+        if force_size:
+            return np.zeros((N, len(names)), dtype=np.float32), names
+        return np.zeros((N, 1), dtype=np.float32), [None]
+
+    W = np.zeros((N, len(names)), dtype=np.float32)
+    for i, nid in enumerate(na["id"]):
+        n = notes[nid]
         if n.articulations:
             for art in n.articulations:
-                if art in names:
-                    j, bf = feature_by_name.setdefault(
-                        art, (len(feature_by_name), np.zeros(N))
-                    )
-                    bf[i] = 1
+                j = name_to_col.get(art)
+                if j is not None:
+                    used_cols.setdefault(art, j)
+                    W[i, j] = 1
 
-    if force_size:
-        M = len(names)
-    else:
-        M = len(feature_by_name) if len(feature_by_name) > 0 else 1
-        names = [None] * M
-    W = np.zeros((N, M))
-
-    for name, (j, bf) in feature_by_name.items():
-        if force_size:
-            j = names.index(name)
+    if not force_size:
+        if len(used_cols) > 0:
+            W = W[:, list(used_cols.values())]
+            names = list(used_cols)
         else:
-            names[j] = name
-        W[:, j] = bf
+            W = np.zeros((N, 1), dtype=np.float32)
+            names = [None]
 
     return W, names
 
@@ -1008,35 +1131,35 @@ def ornament_feature(na, part, **kwargs):
         "haydn",
         "other-ornament",
     ]
-    feature_by_name = {}
-    notes = {n.id: n for n in part.notes_tied}
+    fix_size = kwargs.get("include_empty_features", False)
+
+    name_to_col = {name: j for j, name in enumerate(names)}
+    # columns of the ornaments in the order they are encountered
+    used_cols = {}
+    notes = {n.id: n for n in get_notes_tied(part, **kwargs)}
     N = len(notes)
-    for i, na_n in enumerate(na):
-        n = notes[na_n["id"]]
+    if not any(n.ornaments for n in notes.values()):
+        if fix_size:
+            return np.zeros((N, len(names)), dtype=np.float32), names
+        return np.zeros((N, 1), dtype=np.float32), [None]
+
+    W = np.zeros((N, len(names)), dtype=np.float32)
+    for i, nid in enumerate(na["id"]):
+        n = notes[nid]
         if n.ornaments:
             for art in n.ornaments:
-                if art in names:
-                    j, bf = feature_by_name.setdefault(
-                        art, (len(feature_by_name), np.zeros(N))
-                    )
-                    bf[i] = 1
-    if "include_empty_features" in kwargs.keys():
-        fix_size = kwargs["include_empty_features"]
-    else:
-        fix_size = False
-    if fix_size:
-        M = len(names)
-    else:
-        M = len(feature_by_name) if len(feature_by_name) > 0 else 1
-        names = [None] * M
-    W = np.zeros((N, M))
-
-    for name, (j, bf) in feature_by_name.items():
-        if fix_size:
-            j = names.index(name)
+                j = name_to_col.get(art)
+                if j is not None:
+                    used_cols.setdefault(art, j)
+                    W[i, j] = 1
+
+    if not fix_size:
+        if len(used_cols) > 0:
+            W = W[:, list(used_cols.values())]
+            names = list(used_cols)
         else:
-            names[j] = name
-        W[:, j] = bf
+            W = np.zeros((N, 1), dtype=np.float32)
+            names = [None]
 
     return W, names
 
@@ -1044,11 +1167,11 @@ def ornament_feature(na, part, **kwargs):
 def staff_feature(na, part, **kwargs):
     """Staff feature"""
     names = ["staff"]
-    notes = {n.id: n.staff for n in part.notes_tied}
-    N = len(na)
-    W = np.zeros((N, 1))
-    for i, n in enumerate(na):
-        W[i, 0] = notes[n["id"]] if n["id"] not in (None, "None", "") else 0
+    staff_by_id = {n.id: n.staff for n in get_notes_tied(part, **kwargs)}
+    staffs = [
+        staff_by_id[nid] if nid not in (None, "None", "") else 0 for nid in na["id"]
+    ]
+    W = np.array(staffs, dtype=float).reshape(-1, 1)
     return W, names
 
 
@@ -1071,9 +1194,9 @@ def fermata_feature(na, part, **kwargs):
     """
     names = ["fermata"]
     onsets = na["onset_div"]
-    W = np.zeros((len(onsets), 1))
-    for ferm in part.iter_all(score.Fermata):
-        W[onsets == ferm.start.t, 0] = 1
+    fermata_times = [ferm.start.t for ferm in part.iter_all(score.Fermata)]
+    W = np.zeros((len(onsets), 1), dtype=np.float32)
+    W[np.isin(onsets, fermata_times), 0] = 1
     return W, names
 
 
@@ -1089,40 +1212,56 @@ def metrical_feature(na, part, **kwargs):
     non-zero value in the 'metrical_4_4_weak' descriptor.
 
     """
-    notes_list = part.notes_tied if not np.all(na["pitch"] == 0) else part.rests
+    notes_list = (
+        get_notes_tied(part, **kwargs) if not np.all(na["pitch"] == 0) else part.rests
+    )
     notes = {n.id: n for n in notes_list}
     ts_map = part.time_signature_map
     bm = part.beat_map
-    feature_by_name = {}
     eps = 10**-6
 
-    for i, na_n in enumerate(na):
-        n = notes[na_n["id"]]
-        beats, beat_type, mus_beats = ts_map(n.start.t).astype(int)
-        measure = next(n.start.iter_prev(score.Measure, eq=True), None)
-
-        if measure:
-            measure_start = measure.start.t
-        else:
-            measure_start = 0
-
-        pos = bm(n.start.t) - bm(measure_start)
-
-        if pos % 1 < eps:
-            name = "metrical_{}_{}_{}".format(beats, beat_type, int(pos))
-        else:
-            name = "metrical_{}_{}_weak".format(beats, beat_type)
-
-        j, bf = feature_by_name.setdefault(
-            name, (len(feature_by_name), np.zeros(len(notes)))
+    starts = np.array([notes[nid].start.t for nid in na["id"]])
+    if len(starts) == 0:
+        return np.zeros((len(notes), 0), dtype=np.float32), []
+    measures = list(part.iter_all(score.Measure))
+    measure_idx = measure_indices(measures, starts)
+    has_measure = measure_idx >= 0
+    measure_start_times = np.array([m.start.t for m in measures])
+    measure_starts = np.zeros(len(starts))
+    measure_starts[has_measure] = measure_start_times[measure_idx[has_measure]]
+
+    # evaluate the maps for all notes at once
+    time_signatures = ts_map(starts).astype(int)
+    start_beats, measure_start_beats = bm(np.vstack((starts, measure_starts)))
+    positions = start_beats - measure_start_beats
+
+    # a descriptor is identified by (beats, beat_type, is_weak, beat)
+    is_weak = ~(positions % 1 < eps)
+    keys = np.column_stack(
+        (
+            time_signatures[:, :2],
+            is_weak,
+            np.where(is_weak, 0, np.trunc(positions)).astype(int),
         )
-        bf[i] = 1
+    )
+    unique_keys, first_idx, inverse = np.unique(
+        keys, axis=0, return_index=True, return_inverse=True
+    )
+    # number the descriptors in the order in which they first occur
+    key_order = np.argsort(first_idx)
+    cols = np.empty(len(unique_keys), dtype=int)
+    cols[key_order] = np.arange(len(unique_keys))
 
-    W = np.zeros((len(notes), len(feature_by_name)))
-    names = [None] * len(feature_by_name)
-    for name, (j, bf) in feature_by_name.items():
-        W[:, j] = bf
-        names[j] = name
+    names = [
+        (
+            "metrical_{}_{}_weak".format(beats, beat_type)
+            if weak
+            else "metrical_{}_{}_{}".format(beats, beat_type, beat)
+        )
+        for beats, beat_type, weak, beat in unique_keys[key_order]
+    ]
+    W = np.zeros((len(notes), len(names)), dtype=np.float32)
+    W[np.arange(len(starts)), cols[inverse.reshape(-1)]] = 1
 
     return W, names
 
@@ -1148,11 +1287,13 @@ def metrical_strength_feature(na, part, **kwargs):
 
     relod = na["rel_onset_div"].astype(float)
     totmd = na["tot_measure_div"].astype(float)
-    W = np.zeros((len(na), len(names)))
-    W[:, 0] = np.divide(relod, totmd)  # Onset Phase
-    W[:, 1] = na["is_downbeat"].astype(float)
-    W[:, 2][W[:, 0] == 0.5] = 1.00
-    W[:, 3][W[:, 1] == W[:, 2]] = 1.00
+    W = np.empty((len(na), len(names)))
+    # Onset Phase (0 for notes in measures of zero length)
+    W[:, 0] = 0
+    np.divide(relod, totmd, out=W[:, 0], where=totmd != 0)
+    W[:, 1] = na["is_downbeat"]
+    np.equal(W[:, 0], 0.5, out=W[:, 2], casting="unsafe")
+    np.equal(W[:, 1], W[:, 2], out=W[:, 3], casting="unsafe")
 
     return W, names
 
@@ -1163,12 +1304,13 @@ def measure_feature(na, part, **kwargs):
     This feature encodes the measure each note is in.
 
     """
-    notes_list = part.notes_tied if not np.all(na["pitch"] == 0) else part.rests
+    notes_list = (
+        get_notes_tied(part, **kwargs) if not np.all(na["pitch"] == 0) else part.rests
+    )
     notes = {n.id: n for n in notes_list}
     bm = part.beat_map
 
-    global_start = bm(part.first_point.t)
-    global_end = bm(part.last_point.t)
+    global_start, global_end = bm([part.first_point.t, part.last_point.t])
     global_number = 0  # default global measure number
 
     names = [
@@ -1176,26 +1318,54 @@ def measure_feature(na, part, **kwargs):
         "measure_start_beat",
         "measure_end_beat",
     ]
-    W = np.zeros((len(notes), 3))
+    W = np.empty((len(notes), 3), dtype=np.float32)
+    W[:, 0] = global_number
+    W[:, 1] = global_start
+    W[:, 2] = global_end
+
+    starts = np.array([notes[nid].start.t for nid in na["id"]])
+    measures = list(part.iter_all(score.Measure))
+    measure_idx = measure_indices(measures, starts)
+    has_measure = measure_idx >= 0
+
+    if np.any(has_measure):
+        numbers = np.array([m.number for m in measures], dtype=float)
+        # evaluate the beat map for all measure boundaries at once
+        start_beats, end_beats = bm(
+            np.array([[m.start.t for m in measures], [m.end.t for m in measures]])
+        )
+        idx = measure_idx[has_measure]
+        W[has_measure, 0] = numbers[idx]
+        W[has_measure, 1] = start_beats[idx]
+        W[has_measure, 2] = end_beats[idx]
 
-    for i, na_n in enumerate(na):
-        n = notes[na_n["id"]]
-        measure = next(n.start.iter_prev(score.Measure, eq=True), None)
+    return W, names
 
-        if measure:
-            start = bm(measure.start.t)
-            end = bm(measure.end.t)
-            number = measure.number
-        else:
-            start = global_start
-            end = global_end
-            number = global_number
 
-        W[i, 0] = number
-        W[i, 1] = start
-        W[i, 2] = end
+def measure_indices(measures, times):
+    """Find the measure in which each time falls.
 
-    return W, names
+    Parameters
+    ----------
+    measures : list
+        The measures of a part, in the order of `Part.iter_all`.
+    times : ndarray
+        Times in divs.
+
+    Returns
+    -------
+    ndarray
+        For each time, the index in `measures` of the last measure
+        starting at or before that time, or -1 if there is none. Of
+        several measures starting at the same time, the first one is
+        taken (as with `TimePoint.iter_prev`).
+    """
+    if len(measures) == 0:
+        return np.full(len(times), -1, dtype=int)
+    starts = np.array([m.start.t for m in measures])
+    unique_starts, first = np.unique(starts, return_index=True)
+    pos = np.searchsorted(unique_starts, times, side="right") - 1
+    return np.where(pos >= 0, first[pos], -1)
 
 
 def time_signature_feature(na, part, **kwargs):
@@ -1207,27 +1377,30 @@ def time_signature_feature(na, part, **kwargs):
     ts_map = part.time_signature_map
     possible_beats = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, "other"]
     possible_beat_types = [1, 2, 4, 8, 16, "other"]
-    W_beats = np.zeros((len(na), len(possible_beats)))
-    W_types = np.zeros((len(na), len(possible_beat_types)))
+    W = np.zeros(
+        (len(na), len(possible_beats) + len(possible_beat_types)), dtype=np.float32
+    )
+    W_beats = W[:, : len(possible_beats)]
+    W_types = W[:, len(possible_beats) :]
 
     names = ["time_signature_num_{0}".format(b) for b in possible_beats] + [
         "time_signature_den_{0}".format(b) for b in possible_beat_types
     ]
 
-    for i, n in enumerate(na):
-        beats, beat_type, mus_beats = ts_map(n["onset_div"]).astype(int)
-
-        if beats in possible_beats:
-            W_beats[i, beats - 1] = 1
-        else:
-            W_beats[i, -1] = 1
-
-        if beat_type in possible_beat_types:
-            W_types[i, possible_beat_types.index(beat_type)] = 1
-        else:
-            W_types[i, -1] = 1
+    time_signatures = ts_map(na["onset_div"]).astype(int)
 
-    W = np.column_stack((W_beats, W_types))
+    rows = np.arange(len(na))
+    for W_block, values, categories in (
+        (W_beats, time_signatures[:, 0], possible_beats[:-1]),
+        (W_types, time_signatures[:, 1], possible_beat_types[:-1]),
+    ):
+        categories = np.array(categories)
+        cols = np.searchsorted(categories, values)
+        known = cols < len(categories)
+        known[known] = categories[cols[known]] == values[known]
+        # values that are not among the categories go to "other"
+        cols[~known] = len(categories)
+        W_block[rows, cols] = 1
 
     return W, names
 
@@ -1255,17 +1428,36 @@ def vertical_neighbor_feature(na, part, **kwargs):
         "lowest_pitch",
         "pitch_range",
     ]
-    W = np.zeros((len(na), len(names)))
-    for i, n in enumerate(na):
-        neighbors = na[np.where(na["onset_beat"] == n["onset_beat"])]["pitch"]
-        max_pitch = np.max(neighbors)
-        min_pitch = np.min(neighbors)
-        W[i, 0] = len(neighbors) - 1
-        W[i, 1] = np.sum(neighbors > n["pitch"])
-        W[i, 2] = np.sum(neighbors < n["pitch"])
-        W[i, 3] = max_pitch
-        W[i, 4] = min_pitch
-        W[i, 5] = max_pitch - min_pitch
+    W = np.empty((len(na), len(names)), dtype=np.float32)
+    if len(na) == 0:
+        return W, names
+
+    # sort the notes by onset and pitch, so that simultaneous notes form
+    # contiguous groups, ordered by pitch
+    order = np.lexsort((na["pitch"], na["onset_beat"]))
+    onsets = na["onset_beat"][order]
+    pitches = na["pitch"][order]
+    N = len(order)
+
+    # groups of simultaneous notes
+    new_onset = np.r_[True, onsets[1:] != onsets[:-1]]
+    group = np.cumsum(new_onset) - 1
+    group_start = np.flatnonzero(new_onset)
+    group_end = np.r_[group_start[1:], N]
+    # runs of simultaneous notes with the same pitch
+    new_pitch = new_onset | np.r_[True, pitches[1:] != pitches[:-1]]
+    run = np.cumsum(new_pitch) - 1
+    run_start = np.flatnonzero(new_pitch)
+    run_end = np.r_[run_start[1:], N]
+
+    max_pitch = pitches[group_end - 1][group]
+    min_pitch = pitches[group_start][group]
+    W[order, 0] = (group_end - group_start)[group] - 1
+    W[order, 1] = group_end[group] - run_end[run]
+    W[order, 2] = run_start[run] - group_start[group]
+    W[order, 3] = max_pitch
+    W[order, 4] = min_pitch
+    W[order, 5] = max_pitch - min_pitch
     return W, names
 
 
@@ -1313,12 +1505,12 @@ def normalize(data, method="minmax"):
     if method == "minmax":
         vmin = np.min(data, 0)
         vmax = np.max(data, 0)
-
-        if np.isclose(vmin, vmax):
-            # Return all values as 0 or as 1?
-            return np.zeros_like(data)
-        else:
-            return (data - vmin) / (vmax - vmin)
+        # constant columns are mapped to 0
+        non_constant = ~np.isclose(vmin, vmax)
+        normalized = np.zeros(np.shape(data), dtype=np.result_type(data, 1.0))
+        np.subtract(data, vmin, out=normalized, where=non_constant)
+        np.divide(normalized, vmax - vmin, out=normalized, where=non_constant)
+        return normalized
     elif method == "tanh":
         return np.tanh(data)
     elif method == "tanh_unity":
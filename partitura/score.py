@@ -8,6 +8,7 @@ loudness directions. A score is defined at the highest level by a
 object). This object serves as a timeline at which musical elements
 are registered in terms of their start and end times.
 """
+from bisect import bisect_right
 from copy import copy, deepcopy
 from collections import defaultdict
 from collections.abc import Iterable
@@ -4147,9 +4148,18 @@ def tie_notes(part):
         Description of `part`
 
     """
+    # look up the next measure of a note by its start time, rather than
+    # walking the timeline forward from the note
+    measures = list(part.iter_all(Measure))
+    measure_starts = [measure.start.t for measure in measures]
+
+    def next_measure_after(t):
+        idx = bisect_right(measure_starts, t)
+        return measures[idx] if idx < len(measures) else None
+
     # split and tie notes at measure boundaries
     for note in list(part.iter_all(Note)):
-        next_measure = next(note.start.iter_next(Measure), None)
+        next_measure = next_measure_after(note.start.t)
         cur_note = note
         note_end = cur_note.end
 
@@ -4197,7 +4207,7 @@ def tie_notes(part):
 
             cur_note = next_note
 
-            next_measure = next(cur_note.start.iter_next(Measure), None)
+            next_measure = next_measure_after(cur_note.start.t)
 
         if cur_note != note:
             for slur in slur_stops:
@@ -4208,17 +4218,17 @@ def tie_notes(part):
     max_splits = 3
     failed = 0
     succeeded = 0
-    for i, note in enumerate(list(part.iter_all(Note))):
-        if note.symbolic_duration is None:
-            splits = find_tie_split(
-                note.start.t, note.end.t, int(divs_map(note.start.t)), max_splits
-            )
-
-            if splits:
-                succeeded += 1
-                split_note(part, note, splits)
-            else:
-                failed += 1
+    notes = [note for note in part.iter_all(Note) if note.symbolic_duration is None]
+    # evaluate the divs map once for all notes
+    notes_divs = divs_map([note.start.t for note in notes]).astype(int).tolist()
+    for note, note_divs in zip(notes, notes_divs):
+        splits = find_tie_split(note.start.t, note.end.t, note_divs, max_splits)
+
+        if splits:
+            succeeded += 1
+            split_note(part, note, splits)
+        else:
+            failed += 1
 
 
 def set_end_times(parts):
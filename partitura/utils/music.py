@@ -6,6 +6,7 @@ This module contains music related utilities
 from __future__ import annotations
 import copy
 from collections import defaultdict
+from functools import lru_cache
 import re
 import warnings
 import numpy as np
@@ -601,6 +602,7 @@ def fifths_mode_to_key_name(fifths, mode=None):
     return name + suffix
 
 
+@lru_cache(maxsize=64)
 def key_name_to_fifths_mode(key_name):
     """Return the number of sharps or flats and the mode of a key
     signature name. A negative number denotes the number of flats
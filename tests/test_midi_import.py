@@ -4,6 +4,8 @@
 This module contains tests for importing MIDI files.
 """
 import logging
+import math
+import warnings
 from collections import defaultdict, Counter
 from operator import itemgetter
 import unittest
@@ -14,6 +16,12 @@ from partitura import load_score_midi
 from partitura.utils import partition
 import partitura.score as score
 from partitura import load_performance_midi
+from partitura.io.importmidi import (
+    adjust_time,
+    adjust_times,
+    make_tempo_map,
+    quantize,
+)
 from tests import MIDIINPORT_TESTFILES
 
 LOGGER = logging.getLogger(__name__)
@@ -320,6 +328,14 @@ class TestScoreMidi(unittest.TestCase):
         na = score.note_array(include_time_signature=True)
         self.assertTrue(all([n==3 for n in na["ts_beats"]]))
         self.assertTrue(all([d==8 for d in na["ts_beat_type"]]))
+
+    def test_quantize(self):
+        self.assertEqual(quantize(13.3, 4), 12)
+        self.assertEqual(quantize(3.3, 0.5), 3.5)
+        # non-finite values are passed through as in numpy
+        self.assertTrue(math.isnan(quantize(float("nan"), 0.5)))
+        self.assertEqual(quantize(float("inf"), 0.5), float("inf"))
+        self.assertEqual(quantize(-float("inf"), 0.5), -float("inf"))
         
 class TestLoadPerformanceMIDI(unittest.TestCase):
     def setUp(self):
@@ -376,4 +392,77 @@ class TestLoadPerformanceMIDI(unittest.TestCase):
         self.assertAlmostEqual(key_signatures[0]['time'], 0.0, places=6)
 
         self.assertEqual(key_signatures[1]['key_name'], 'G')
-        self.assertAlmostEqual(key_signatures[1]['time'], 0.5, places=6)  # 120 BPM -> 0.5 seconds
\ No newline at end of file
+        self.assertAlmostEqual(key_signatures[1]['time'], 0.5, places=6)  # 120 BPM -> 0.5 seconds
+
+    def test_adjust_times(self):
+        inv_ppq_us = 1.0 / (480 * 10**6)
+        tempo_changes = [(0, 500000), (0, 600000), (480, 1000000), (1200, 400000)]
+        ticks = [0, 240, 480, 481, 1199, 1200, 5000]
+        # 600000 mpq until tick 480, 1000000 mpq until tick 1200, then 400000
+        expected = [0.0, 0.3, 0.6, 0.6 + 1 / 480, 0.6 + 719 / 480, 2.1]
+        expected.append(2.1 + 3800 / 1200)
+        tempo_map = make_tempo_map(tempo_changes, inv_ppq_us)
+        times = adjust_times(ticks, tempo_map, inv_ppq_us)
+        for tick, time, exp in zip(ticks, times, expected):
+            self.assertAlmostEqual(time, exp, places=9)
+            self.assertAlmostEqual(
+                time, adjust_time(tick, tempo_changes, 480), places=9
+            )
+
+    def test_tempo_changes_in_several_tracks(self):
+        # tempo changes in different tracks are not in tick order when
+        # the tracks are read one after the other
+        midi_file = mido.MidiFile(ticks_per_beat=480)
+        track = mido.MidiTrack()
+        track.append(mido.Message("note_on", note=60, velocity=64, time=0))
+        track.append(
+            mido.MetaMessage("set_tempo", tempo=mido.bpm2tempo(60), time=960)
+        )
+        track.append(mido.Message("note_off", note=60, velocity=64, time=480))
+        tempo_track = mido.MidiTrack()
+        tempo_track.append(
+            mido.MetaMessage("set_tempo", tempo=mido.bpm2tempo(240), time=480)
+        )
+        midi_file.tracks.extend([track, tempo_track])
+
+        notes = load_performance_midi(midi_file).performedparts[0].notes
+        self.assertAlmostEqual(notes[0]["note_on"], 0.0, places=6)
+        # 480 ticks at 120 BPM, 480 ticks at 240 BPM and 480 ticks at 60 BPM
+        self.assertAlmostEqual(notes[0]["note_off"], 1.75, places=6)
+
+
+class TestOrphanNoteOffs(unittest.TestCase):
+    def setUp(self):
+        # note offs without a matching note on: three in the first track,
+        # one in the second track
+        self.midi_file = mido.MidiFile(ticks_per_beat=480)
+        track = mido.MidiTrack()
+        track.append(mido.Message("note_off", note=62, velocity=64, time=0))
+        track.append(mido.Message("note_on", note=60, velocity=64, time=0))
+        track.append(mido.Message("note_off", note=60, velocity=64, time=480))
+        track.append(mido.Message("note_off", note=60, velocity=64, time=0))
+        track.append(mido.Message("note_on", note=64, velocity=0, time=0))
+        other_track = mido.MidiTrack()
+        other_track.append(mido.Message("note_on", note=67, velocity=64, time=0))
+        other_track.append(mido.Message("note_off", note=65, velocity=64, time=240))
+        other_track.append(mido.Message("note_off", note=67, velocity=64, time=240))
+        self.midi_file.tracks.extend([track, other_track])
+
+    def check_warnings(self, load_fn):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            load_fn(self.midi_file)
+        messages = [
+            str(w.message) for w in caught if str(w.message).startswith("ignoring")
+        ]
+        self.assertEqual(len(messages), 2)
+        self.assertTrue(messages[0].startswith("ignoring 3 note off"))
+        self.assertIn("in track 0", messages[0])
+        self.assertTrue(messages[1].startswith("ignoring 1 note off"))
+        self.assertIn("in track 1", messages[1])
+
+    def test_load_performance_midi(self):
+        self.check_warnings(load_performance_midi)
+
+    def test_load_score_midi(self):
+        self.check_warnings(load_score_midi)
@@ -7,13 +7,13 @@ This file contains test functions for MEI import
 import unittest
 
 from tests import MUSESCORE_TESTFILES
-from partitura import load_musicxml, load_mei, EXAMPLE_MEI
+from partitura import load_musicxml, load_mei, EXAMPLE_MEI, EXAMPLE_MUSICXML
 import partitura.score as score
 from partitura.io.importmei import MeiParser
 from partitura.utils import compute_pianoroll
 from lxml import etree
 from xmlschema.names import XML_NAMESPACE
-from partitura.io import load_score, load_via_musescore
+from partitura.io import load_score, load_via_musescore, load_via_musescore_batch
 from partitura.io.musescore import find_musescore, MuseScoreNotFoundException
 import platform
 
@@ -29,5 +29,14 @@ try:
             # try the generic loading function
             score = load_score(MUSESCORE_TESTFILES[0])
             self.assertTrue(len(score.parts) == 1)
+
+        def test_batch(self):
+            filenames = [MUSESCORE_TESTFILES[0], EXAMPLE_MUSICXML]
+            scores = load_via_musescore_batch(filenames)
+            self.assertTrue(len(scores) == len(filenames))
+            # the scores are returned in the order of the filenames
+            for fn, score in zip(filenames, scores):
+                expected = load_via_musescore(fn)
+                self.assertTrue(len(score.note_array()) == len(expected.note_array()))
 except MuseScoreNotFoundException:
     pass
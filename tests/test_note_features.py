@@ -5,6 +5,7 @@ This module contains tests for methods for generating note-level features.
 """
 import unittest
 from tests import (
+    CROSS_STAFF_TESTFILES,
     METRICAL_POSITION_TESTFILES,
     MUSICXML_IMPORT_EXPORT_TESTFILES,
     MEI_TESTFILES,
@@ -12,6 +13,14 @@ from tests import (
 )
 from partitura import load_musicxml, load_mei
 from partitura.musicanalysis import make_note_feats, compute_note_array
+from partitura.musicanalysis.note_features import (
+    clef_feature,
+    normalize,
+    vertical_neighbor_feature,
+)
+import partitura.score as score
+from partitura.score import merge_parts
+from partitura.utils.music import ensure_notearray
 import numpy as np
 
 
@@ -74,6 +83,103 @@ class TestingNoteFeatureExtraction(unittest.TestCase):
             self.assertTrue(np.all(starttest), "measure start feature does not match")
             self.assertTrue(np.all(endtest), "measure end feature does not match")
 
+    def test_clef_feature(self):
+        # the clef of this part is on staff 2, staff 1 has no clef
+        fn = [f for f in CROSS_STAFF_TESTFILES if f.endswith(".mei")][0]
+        part = load_mei(fn).parts[1]
+        na = part.note_array(include_staff=True)
+        feats, names = make_note_feats(part, ["clef_feature"])
+        self.assertEqual(
+            names,
+            [
+                "clef_feature.clef_sign",
+                "clef_feature.clef_line",
+                "clef_feature.clef_octave_change",
+            ],
+        )
+        self.assertTrue(np.any(na["staff"] == 1))
+        self.assertTrue(np.all(feats[na["staff"] == 1] == [6, 0, 0]))
+        self.assertTrue(np.all(feats[na["staff"] == 2] == [1, 4, 0]))
+
+        # notes before the first clef of their staff take that clef
+        part = score.Part("P0", quarter_duration=4)
+        part.add(score.Note(step="C", octave=4, staff=1, id="n0"), 0, 4)
+        part.add(score.Note(step="D", octave=4, staff=1, id="n1"), 8, 12)
+        part.add(score.Clef(staff=1, sign="F", line=4, octave_change=0), 4)
+        part.add(score.Clef(staff=1, sign="G", line=2, octave_change=0), 10)
+        feats, _ = clef_feature(part.note_array(), part)
+        self.assertTrue(np.all(feats == [[1, 4, 0], [1, 4, 0]]))
+
+    def test_beat_phase_zero_length_measures(self):
+        fn = [f for f in MEI_TESTFILES if f.endswith("test_divs_tuplet.mei")][0]
+        score = load_mei(fn)
+        na = ensure_notearray(merge_parts(score.parts), include_metrical_position=True)
+        zero_length = na["tot_measure_div"] == 0
+        self.assertTrue(np.any(zero_length))
+        feats, names = make_note_feats(score, "all")
+        beat_phase = feats[:, names.index("metrical_strength_feature.beat_phase")]
+        self.assertTrue(np.all(beat_phase[zero_length] == 0))
+
+    def test_user_feature_function(self):
+        def user_feature(na, part, include_empty_features=True):
+            return np.ones((len(na), 1)), ["one"]
+
+        for fn in MUSICXML_NOTE_FEATURES:
+            score = load_musicxml(fn, force_note_ids=True)
+            feats, names = make_note_feats(
+                score[0], [user_feature, "polynomial_pitch_feature"]
+            )
+            self.assertEqual(
+                names,
+                ["user_feature.one", "polynomial_pitch_feature.pitch"],
+            )
+            self.assertTrue(np.all(feats[:, 0] == 1))
+
+    def test_normalize_minmax(self):
+        data = np.array([[1.0, 2.0, 5.0], [3.0, 2.0, 0.0], [2.0, 2.0, 10.0]])
+        normalized = normalize(data, method="minmax")
+        expected = np.array([[0.0, 0.0, 0.5], [1.0, 0.0, 0.0], [0.5, 0.0, 1.0]])
+        self.assertTrue(
+            np.allclose(normalized, expected), "minmax normalization does not match"
+        )
+        self.assertTrue(np.all(normalize(np.ones(4), method="minmax") == 0))
+
+    def test_vertical_neighbor_feature(self):
+        def brute_force(na):
+            W = np.zeros((len(na), 6))
+            for i, n in enumerate(na):
+                neighbors = na["pitch"][na["onset_beat"] == n["onset_beat"]]
+                W[i, 0] = len(neighbors) - 1
+                W[i, 1] = np.sum(neighbors > n["pitch"])
+                W[i, 2] = np.sum(neighbors < n["pitch"])
+                W[i, 3] = neighbors.max()
+                W[i, 4] = neighbors.min()
+                W[i, 5] = neighbors.max() - neighbors.min()
+            return W
+
+        dtype = [("onset_beat", "f4"), ("pitch", "i4")]
+        # duplicate pitches at the same onset, a single-note onset and
+        # onsets that are not sorted
+        note_arrays = [
+            np.array(
+                [(1, 64), (0, 60), (0, 60), (2, 62), (0, 67), (1, 64), (0, 55)],
+                dtype=dtype,
+            )
+        ]
+        rng = np.random.RandomState(1984)
+        for n_notes in [0, 1, 5, 50]:
+            # few onsets and pitches, so that there are both single-note
+            # onsets and duplicate pitches at the same onset
+            na = np.zeros(n_notes, dtype=dtype)
+            na["onset_beat"] = rng.randint(0, 8, n_notes) / 2
+            na["pitch"] = rng.randint(60, 66, n_notes)
+            note_arrays.append(na)
+
+        for na in note_arrays:
+            W, names = vertical_neighbor_feature(na, None)
+            self.assertEqual(W.shape, (len(na), len(names)))
+            self.assertTrue(np.all(W == brute_force(na)))
+
 
 
 if __name__ == "__main__":